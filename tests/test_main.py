@@ -0,0 +1,170 @@
+import re
+
+import pandas as pd
+
+from xl2times import utils
+from xl2times.__main__ import compare, produce_times_tables, write_dd_files
+from xl2times.datatypes import Config, TimesModel
+
+utils.setup_logger(None)
+
+
+def _config() -> Config:
+    return Config(
+        "times_mapping.txt",
+        "times-info.json",
+        "times-sets.json",
+        "veda-tags.json",
+        "veda-attr-defaults.json",
+        "",
+        False,
+    )
+
+
+def _dd_tables() -> dict[str, pd.DataFrame]:
+    """TIMES tables whose DD lines are ordered differently from their key columns
+    unless the sort accounts for the quotes and separators around each value.
+    """
+    keys = ["A-1", "A", "A.1", "A 1", "B"]
+    return {
+        "ALL_TS": pd.DataFrame({"ALL_TS": ["ANNUAL", "S", "W", "R"]}),
+        "COM_DESC": pd.DataFrame(
+            {"REG": ["R"] * 5, "COM": keys, "TEXT": ["x", "d", "c", "b", "a"]}
+        ),
+        "COM_PROJ": pd.DataFrame(
+            {
+                "REG": ["R", "R-1", "R", "R.1", "R"],
+                "YEAR": ["2020"] * 5,
+                "COM": keys,
+                "VALUE": ["1", "2", "3", "4", "5"],
+            }
+        ),
+        "G_DYEAR": pd.DataFrame({"VALUE": ["2005", "2005 ", "200", "2005.5"]}),
+        # IRE_BND repeats the ALL_R index
+        "IRE_BND": pd.DataFrame(
+            [
+                [r1, "2020", c, "ANNUAL", r2, "IMP", "UP", "1"]
+                for r1, r2, c in [
+                    ("R", "R-1", "A"),
+                    ("R", "R", "A"),
+                    ("R-1", "R", "A"),
+                    ("R", "R 1", "A"),
+                    ("R", "R", "A.1"),
+                ]
+            ],
+            columns=["ALL_R", "YEAR", "COM", "TS", "ALL_R", "IE", "BD", "VALUE"],
+        ),
+        "TOP": pd.DataFrame(
+            {
+                "REG": ["R"] * 4,
+                "PRC": ["P", "P-1", "P", "P 1"],
+                "COM": ["A", "A", "A.1", "A"],
+                "IO": ["IN", "OUT", "IN", "IN"],
+            }
+        ),
+    }
+
+
+def _dd_block(df: pd.DataFrame, data_column: str, sort: bool) -> str:
+    """Formats a DD table body row by row, as write_dd_files originally did."""
+    query_columns = [c for c in df.columns if c != data_column]
+    if data_column in df.columns:
+        df = df.drop_duplicates(subset=query_columns or None, keep="last")
+    lines = []
+    for row in df.itertuples(index=False, name=None):
+        key = "'.'".join(str(x) for c, x in zip(df.columns, row) if c != data_column)
+        data = dict(zip(df.columns, row)).get(data_column)
+        if data_column not in df.columns:
+            lines.append(f"'{key}'\n")
+        elif data_column == "TEXT":
+            lines.append(f"'{key}' '{data}'\n")
+        else:
+            lines.append(f"'{key}' {data}\n" if key else f"{data}\n")
+    return "".join(sorted(lines) if sort else lines)
+
+
+def _read_dd_blocks(path) -> dict[str, str]:
+    return dict(
+        re.findall(
+            r"(?:SET|PARAMETER\n)\s*(\w+)[^/]*/\n(.*?)\n/;", path.read_text(), re.S
+        )
+    )
+
+
+class TestMain:
+    def test_compare(self, tmp_path):
+        """Tests that rows are matched case-insensitively, ignoring duplicates."""
+        ground_truth = {
+            "A": pd.DataFrame({"x": ["a", "B", "c", "c"], "y": ["1", "2", "3", "3"]}),
+            "M": pd.DataFrame({"x": ["q"]}),
+        }
+        data = {
+            "A": pd.DataFrame({"x": ["A", "b", "d", "d"], "y": ["1", "2", "4", "4"]}),
+            "E": pd.DataFrame({"z": ["1", "2"]}),
+        }
+        result = compare(data, ground_truth, str(tmp_path))
+        assert result == (
+            "66.7% of ground truth rows present in output (2/3), 3 additional rows"
+        )
+        additional = pd.read_csv(tmp_path / "A_additional.csv", dtype=str)
+        assert additional.equals(pd.DataFrame({"x": ["d"], "y": ["4"]}))
+        missing = pd.read_csv(tmp_path / "A_missing.csv", dtype=str)
+        assert missing.equals(pd.DataFrame({"x": ["c"], "y": ["3"]}))
+
+    def test_write_dd_files_sorted(self, tmp_path):
+        """Tests that each DD table is written in the order of its sorted lines."""
+        tables = _dd_tables()
+        write_dd_files(tables, _config(), str(tmp_path))
+
+        blocks = _read_dd_blocks(tmp_path / "output.dd")
+        assert blocks.keys() == tables.keys() - {"ALL_TS"}
+        for tablename, block in blocks.items():
+            lines = block.splitlines()
+            assert len(lines) == len(tables[tablename])
+            assert lines == sorted(lines)
+
+        ts = (tmp_path / "ts.dd").read_text()
+        assert ts == "SET ALL_TS\n/\n'ANNUAL'\n'S'\n'W'\n'R'\n\n/;\n"
+
+    def test_write_dd_files_matches_row_formatting(self, tmp_path):
+        """Tests that DD tables match formatting each row on its own, including
+        parameters whose TIMES indexes repeat a name and duplicate keys.
+        """
+        tables = _dd_tables()
+        # A later value for an existing key replaces the earlier one
+        tables["IRE_BND"].loc[len(tables["IRE_BND"])] = tables["IRE_BND"].iloc[0]
+        tables["IRE_BND"].iloc[-1, -1] = "2"
+        config = _config()
+        write_dd_files(tables, config, str(tmp_path))
+
+        sets = {m.times_name for m in config.times_xl_maps if "VALUE" not in m.col_map}
+        blocks = _read_dd_blocks(tmp_path / "output.dd")
+        blocks.update(_read_dd_blocks(tmp_path / "ts.dd"))
+        assert blocks.keys() == tables.keys()
+        for tablename, df in tables.items():
+            data_column = "TEXT" if tablename in sets else "VALUE"
+            expected = _dd_block(df, data_column, tablename != "ALL_TS")
+            assert blocks[tablename] == expected
+
+    def test_write_dd_files_repeated_index(self, tmp_path):
+        """Tests that parameters whose TIMES indexes repeat a name are written."""
+        config = _config()
+        attributes = pd.DataFrame(
+            {
+                "attribute": ["IRE_BND"],
+                "region": ["R2"],
+                "year": ["X"],
+                "commodity": ["X"],
+                "timeslice": ["X"],
+                "other_indexes": ["X"],
+                "limtype": ["X"],
+                "value": ["1"],
+            }
+        )
+        tables = produce_times_tables(config, {"Attributes": attributes}, TimesModel())
+        write_dd_files(tables, config, str(tmp_path))
+
+        output = (tmp_path / "output.dd").read_text()
+        assert (
+            "PARAMETER\nIRE_BND ' '/\n'R2'.'X'.'X'.'X'.'R2'.'X'.'X' 1\n\n/;" in output
+        )
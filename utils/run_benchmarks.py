@@ -6,7 +6,7 @@ import subprocess
 import sys
 import time
 from collections import namedtuple
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from os import path, symlink
 from typing import Any
@@ -22,6 +22,10 @@ from xl2times.__main__ import parse_args, run
 from xl2times.dd_to_csv import main
 from xl2times.utils import max_workers
 
+# Each benchmark is run as a subprocess, so threads are enough to run them in
+# parallel. Every run also starts its own process pool, so only use half the workers.
+benchmark_workers = max(1, max_workers // 2)
+
 
 def parse_result(output: str) -> tuple[float, int, int]:
     # find pattern in multiline string
@@ -203,7 +207,9 @@ def run_benchmark(
         logger.error(f"--skip_csv is true but {csv_folder} does not exist")
         sys.exit(6)
 
-    # Then run the tool
+    # Then run the tool. --no_cache is deliberately not passed: the xlsx cache is keyed
+    # by file content, so the run on main and benchmarks sharing input files reuse
+    # the tables extracted by the first run instead of parsing the workbooks again.
     args = [
         "--output_dir",
         out_folder,
@@ -290,10 +296,10 @@ def run_all_benchmarks(
     )
 
     if debug or seq:
-        # bypass process pool and call benchmarks directly if --debug is set.
+        # bypass thread pool and call benchmarks directly if --debug is set.
         results = [run_a_benchmark(b) for b in benchmarks]
     else:
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        with ThreadPoolExecutor(benchmark_workers) as executor:
             results = list(executor.map(run_a_benchmark, benchmarks))
 
     logger.info("\n\n" + tabulate(results, headers, floatfmt=".1f") + "\n")
@@ -358,7 +364,7 @@ def run_all_benchmarks(
         if debug or seq:
             results_main = [run_a_benchmark(b) for b in benchmarks]
         else:
-            with ProcessPoolExecutor(max_workers) as executor:
+            with ThreadPoolExecutor(benchmark_workers) as executor:
                 results_main = list(executor.map(run_a_benchmark, benchmarks))
 
     # Print table with combined results to make comparison easier
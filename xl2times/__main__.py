@@ -5,7 +5,8 @@ import pickle
 import sys
 import time
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from io import StringIO
 from pathlib import Path
@@ -19,6 +20,10 @@ from . import excel, transforms, utils
 from .datatypes import Config, DataModule, EmbeddedXlTable, TimesModel
 
 _log_sep = "=" * 80 + "\n"
+# String values that mark a missing value in tables produced for TIMES
+_missing_values = ["None", "nan", "", "<NA>"]
+# Number of rows formatted at a time when writing DD files
+_dd_chunk_rows = 65536
 
 
 cache_dir = Path.home() / ".cache/xl2times/"
@@ -44,8 +49,10 @@ def _read_xlsx_cached(filename: str | Path) -> list[EmbeddedXlTable]:
     """Extract EmbeddedXlTables from xlsx file (cached).
 
     Since excel.extract_tables is quite slow, we cache its results in `cache_dir`.
-    Each cache file is named {filename}_{hash}.pkl, and contains a pickled
-    `[EmbeddedXlTable]`.
+    Each cache file is named {filename}_{hash}.pkl, and contains an uncompressed
+    `[EmbeddedXlTable]` written with `pd.to_pickle`. The extracted dataframes are
+    always of dtype object, so they have no numeric buffers that could be pickled
+    out-of-band and memory-mapped on load.
 
     Args:
         filename: Path to the xlsx file to extract tables from.
@@ -58,14 +65,14 @@ def _read_xlsx_cached(filename: str | Path) -> list[EmbeddedXlTable]:
 
     if cached_file.exists():
         # just load and return the cached pickle
-        with cached_file.open("rb") as f:
-            tables = pickle.load(f)
-            logger.info(f"Using cached data for {filename} from {cached_file}")
+        tables = pd.read_pickle(cached_file, compression=None)
+        logger.info(f"Using cached data for {filename} from {cached_file}")
     else:
         # extract data and write it to cache before returning it
         tables = excel.extract_tables(str(filename))
-        with cached_file.open("wb") as f:
-            pickle.dump(tables, f)
+        pd.to_pickle(
+            tables, cached_file, compression=None, protocol=pickle.HIGHEST_PROTOCOL
+        )
         logger.info(f"Saved cache for {filename} to {cached_file}")
 
     return tables
@@ -78,116 +85,127 @@ def convert_xl_to_times(
     model: TimesModel,
     no_cache: bool,
     stop_after_read: bool = False,
+    debug_dumps: bool = False,
 ) -> dict[str, DataFrame]:
     start_time = datetime.now()
 
     invalidate_cache()
-    with ProcessPoolExecutor(utils.max_workers) as executor:
-        raw_tables = executor.map(
+    try:
+        # The process pool is shared by the extraction and the parallel transforms
+        raw_tables = utils.pmap(
             excel.extract_tables if no_cache else _read_xlsx_cached, input_files
         )
-    # raw_tables is a list of lists, so flatten it:
-    raw_tables = [t for ts in raw_tables for t in ts]
-    logger.info(
-        f"Extracted (potentially cached) {len(raw_tables)} tables,"
-        f" {sum(table.dataframe.shape[0] for table in raw_tables)} rows"
-        f" in {datetime.now() - start_time}"
-    )
+        # raw_tables is a list of lists, so flatten it:
+        raw_tables = [t for ts in raw_tables for t in ts]
+        logger.info(
+            f"Extracted (potentially cached) {len(raw_tables)} tables,"
+            f" {sum(table.dataframe.shape[0] for table in raw_tables)} rows"
+            f" in {datetime.now() - start_time}"
+        )
 
-    if stop_after_read:
-        # Convert absolute paths to relative paths to enable comparing raw_tables.txt across machines
-        raw_tables.sort(key=lambda x: (x.filename, x.sheetname, x.range))
-        input_dir = os.path.commonpath([t.filename for t in raw_tables])
-        raw_tables = [strip_filename_prefix(t, input_dir) for t in raw_tables]
-
-    dump_tables(raw_tables, os.path.join(output_dir, "raw_tables.txt"))
-    if stop_after_read:
-        return {}
-
-    transform_list = [
-        transforms.normalize_tags_columns,
-        transforms.remove_fill_tables,
-        lambda config, tables, model: [
-            transforms.remove_comment_cols(t) for t in tables
-        ],
-        transforms.validate_input_tables,
-        transforms.remove_tables_with_formulas,  # slow
-        transforms.normalize_column_aliases,
-        transforms.remove_comment_rows,
-        transforms.revalidate_input_tables,
-        transforms.capitalise_table_values,
-        transforms.process_regions,
-        transforms.convert_com_tables,
-        transforms.process_time_periods,
-        transforms.remove_exreg_cols,
-        transforms.generate_dummy_processes,
-        transforms.process_time_slices,
-        transforms.process_transform_table_variants,
-        transforms.apply_tag_specified_defaults,
-        transforms.process_transform_tables,
-        transforms.process_transform_availability,
-        transforms.process_flexible_import_tables,  # slow
-        transforms.process_user_constraint_tables,
-        transforms.harmonise_tradelinks,
-        transforms.include_tables_source,
-        transforms.process_processes,
-        transforms.fill_in_column_defaults,
-        transforms.create_model_topology,
-        transforms.generate_uc_properties,
-        transforms.expand_rows_parallel,  # slow
-        transforms.process_tradelinks,
-        transforms.merge_tables,
-        transforms.remove_invalid_values,
-        transforms.include_cgs_in_topology,
-        transforms.fill_in_missing_pcgs,
-        transforms.complete_processes,
-        transforms.create_model_units,
-        transforms.process_wildcards,
-        transforms.convert_aliases,
-        transforms.enforce_availability,
-        transforms.complete_model_trade,
-        transforms.create_model_cgs,
-        transforms.prepare_for_querying,
-        transforms.apply_transform_tables,
-        transforms.generate_implied_topology,
-        transforms.verify_uc_topology,
-        transforms.explode_process_commodity_cols,
-        transforms.apply_final_fixup,
-        transforms.assign_model_attributes,
-        transforms.resolve_remaining_cgs,
-        lambda config, tables, model: dump_tables(
-            tables, os.path.join(output_dir, "merged_tables.txt")
-        ),
-        transforms.complete_dictionary,
-        transforms.convert_to_string,
-        lambda config, tables, model: produce_times_tables(config, tables, model),
-    ]
+        if stop_after_read:
+            # Convert absolute paths to relative paths to enable comparing raw_tables.txt across machines
+            raw_tables.sort(key=lambda x: (x.filename, x.sheetname, x.range))
+            # The tables are sorted by filename, so the first and last share the common prefix
+            input_dir = os.path.commonpath(
+                [raw_tables[0].filename, raw_tables[-1].filename]
+            )
+            raw_tables = [strip_filename_prefix(t, input_dir) for t in raw_tables]
+
+        # raw_tables.txt is the output of stop_after_read, and otherwise only for debugging
+        if stop_after_read or debug_dumps:
+            dump_tables(raw_tables, os.path.join(output_dir, "raw_tables.txt"))
+        if stop_after_read:
+            return {}
+
+        transform_list = [
+            transforms.normalize_tags_columns,
+            transforms.remove_fill_tables,
+            lambda config, tables, model: [
+                transforms.remove_comment_cols(t) for t in tables
+            ],
+            transforms.validate_input_tables,
+            transforms.remove_tables_with_formulas,  # slow
+            transforms.normalize_column_aliases,
+            transforms.remove_comment_rows,
+            transforms.revalidate_input_tables,
+            transforms.capitalise_table_values,
+            transforms.process_regions,
+            transforms.convert_com_tables,
+            transforms.process_time_periods,
+            transforms.remove_exreg_cols,
+            transforms.generate_dummy_processes,
+            transforms.process_time_slices,
+            transforms.process_transform_table_variants,
+            transforms.apply_tag_specified_defaults,
+            transforms.process_transform_tables,
+            transforms.process_transform_availability,
+            transforms.process_flexible_import_tables,  # slow
+            transforms.process_user_constraint_tables,
+            transforms.harmonise_tradelinks,
+            transforms.include_tables_source,
+            transforms.process_processes,
+            transforms.fill_in_column_defaults,
+            transforms.create_model_topology,
+            transforms.generate_uc_properties,
+            transforms.expand_rows_parallel,  # slow
+            transforms.process_tradelinks,
+            transforms.merge_tables,
+            transforms.remove_invalid_values,
+            transforms.include_cgs_in_topology,
+            transforms.fill_in_missing_pcgs,
+            transforms.complete_processes,
+            transforms.create_model_units,
+            transforms.process_wildcards,
+            transforms.convert_aliases,
+            transforms.enforce_availability,
+            transforms.complete_model_trade,
+            transforms.create_model_cgs,
+            transforms.prepare_for_querying,
+            transforms.apply_transform_tables,
+            transforms.generate_implied_topology,
+            transforms.verify_uc_topology,
+            transforms.explode_process_commodity_cols,
+            transforms.apply_final_fixup,
+            transforms.assign_model_attributes,
+            transforms.resolve_remaining_cgs,
+            lambda config, tables, model: (
+                dump_tables(tables, os.path.join(output_dir, "merged_tables.txt"))
+                if debug_dumps
+                else tables
+            ),
+            transforms.complete_dictionary,
+            transforms.convert_to_string,
+            lambda config, tables, model: produce_times_tables(config, tables, model),
+        ]
+
+        input = raw_tables
+        output = {}
+        for transform in transform_list:
+            start_time = time.time()
+            output = transform(config, input, model)
+            end_time = time.time()
+            logger.opt(raw=True).debug(_log_sep)
+            logger.info(
+                f"transform {transform.__code__.co_name} took {end_time - start_time:.2f} seconds"
+            )
+            logger.opt(raw=True).debug(_log_sep)
+            # Way to conditionally evaluate the table dump only on debug log level
+            # https://loguru.readthedocs.io/en/stable/overview.html#lazy-evaluation-of-expensive-functions
+            logger.opt(lazy=True).debug(
+                "All tables:\n{dump}", dump=lambda: _all_table_dump(output)
+            )
+            input = output
+        assert isinstance(output, dict)
 
-    input = raw_tables
-    output = {}
-    for transform in transform_list:
-        start_time = time.time()
-        output = transform(config, input, model)
-        end_time = time.time()
-        logger.opt(raw=True).debug(_log_sep)
         logger.info(
-            f"transform {transform.__code__.co_name} took {end_time - start_time:.2f} seconds"
-        )
-        logger.opt(raw=True).debug(_log_sep)
-        # Way to conditionally evaluate the table dump only on debug log level
-        # https://loguru.readthedocs.io/en/stable/overview.html#lazy-evaluation-of-expensive-functions
-        logger.opt(lazy=True).debug(
-            "All tables:\n{dump}", dump=lambda: _all_table_dump(output)
+            f"Conversion complete, {len(output)} tables produced,"
+            f" {sum(df.shape[0] for df in output.values())} rows"
         )
-        input = output
-    assert isinstance(output, dict)
-
-    logger.info(
-        f"Conversion complete, {len(output)} tables produced,"
-        f" {sum(df.shape[0] for df in output.values())} rows"
-    )
 
-    return output
+        return output
+    finally:
+        utils.shutdown_executor()
 
 
 def _all_table_dump(tables: list[EmbeddedXlTable] | dict[str, DataFrame]) -> str:
@@ -208,40 +226,73 @@ def _all_table_dump(tables: list[EmbeddedXlTable] | dict[str, DataFrame]) -> str
 
 def write_csv_tables(tables: dict[str, DataFrame], output_dir: str):
     os.makedirs(output_dir, exist_ok=True)
-    for item in os.listdir(output_dir):
-        if item.endswith(".csv"):
-            os.remove(os.path.join(output_dir, item))
-    for tablename, df in tables.items():
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".csv") and entry.is_file():
+                os.remove(entry.path)
+
+    def write_table(tablename: str, df: DataFrame):
         df.to_csv(os.path.join(output_dir, tablename + "_output.csv"), index=False)
+
+    # Writing is largely I/O, so overlap it across threads
+    with ThreadPoolExecutor(utils.max_workers) as executor:
+        # Consume the results so that any exception is raised here
+        list(executor.map(write_table, tables.keys(), tables.values()))
     logger.success(
         f"Excel files successfully converted to CSV and written to {output_dir}"
     )
 
 
 def read_csv_tables(input_dir: str) -> dict[str, DataFrame]:
-    result = {}
-    csv_files = list(Path(input_dir).glob("*.csv"))
-    for filename in csv_files:
-        result[filename.stem] = pd.read_csv(filename)
-    return result
+    with os.scandir(input_dir) as entries:
+        csv_files = {
+            entry.name[: -len(".csv")]: entry.path
+            for entry in entries
+            if entry.name.endswith(".csv") and entry.is_file()
+        }
+
+    def read_csv(path: str) -> DataFrame:
+        # Unlike the C engine, pyarrow reads empty cells of string columns as None
+        return pd.read_csv(path, engine="pyarrow").fillna(np.nan)
+
+    # The pyarrow engine parses each file with multiple threads, and the thread pool
+    # overlaps reading the many small files typical of a ground truth directory
+    with ThreadPoolExecutor(utils.max_workers) as executor:
+        dfs = executor.map(read_csv, csv_files.values())
+        return dict(zip(csv_files.keys(), dfs))
+
+
+def _hash_rows(df: DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Hash the lowercased values of each row of `df`.
+
+    Returns the row hashes, and a mask selecting the first occurrence of each hash.
+    """
+    lowered = DataFrame(
+        {i: df.iloc[:, i].astype(str).str.lower() for i in range(df.shape[1])}
+    )
+    hashes = pd.util.hash_pandas_object(lowered, index=False).to_numpy()
+    return hashes, ~pd.Series(hashes).duplicated().to_numpy()
 
 
 def compare(
     data: dict[str, DataFrame], ground_truth: dict[str, DataFrame], output_dir: str
 ) -> str:
+    # Row counts of the ground truth tables, used for logging and ordering
+    gt_rows = {name: df.shape[0] for name, df in ground_truth.items()}
     logger.info(
         f"Ground truth contains {len(ground_truth)} tables,"
-        f" {sum(df.shape[0] for _, df in ground_truth.items())} rows"
+        f" {sum(gt_rows.values())} rows"
     )
 
-    missing = set(ground_truth.keys()).difference(data.keys())
-    missing_str = ", ".join(
-        [f"{x} ({ground_truth[x].shape[0]})" for x in sorted(missing)]
-    )
+    # Dict key views support set operations directly
+    gt_keys = ground_truth.keys()
+    data_keys = data.keys()
+    missing = gt_keys - data_keys
+    missing_str = ", ".join([f"{x} ({gt_rows[x]})" for x in sorted(missing)])
     if len(missing) > 0:
         logger.info(f"Missing {len(missing)} tables: {missing_str}")
 
-    additional_tables = set(data.keys()).difference(ground_truth.keys())
+    additional_tables = data_keys - gt_keys
     additional_str = ", ".join(
         [f"{x} ({data[x].shape[0]})" for x in sorted(additional_tables)]
     )
@@ -252,10 +303,9 @@ def compare(
 
     total_gt_rows = 0
     total_correct_rows = 0
-    for table_name, gt_table in sorted(
-        ground_truth.items(), reverse=True, key=lambda t: len(t[1])
-    ):
-        if table_name in data:
+    for table_name in sorted(gt_rows, key=lambda name: -gt_rows[name]):
+        if table_name in data_keys:
+            gt_table = ground_truth[table_name]
             data_table = data[table_name]
 
             # Remove .integer suffix added to duplicate column names by CSV reader (mangle_dupe_cols=False not supported)
@@ -267,27 +317,29 @@ def compare(
                     f" {data_cols}, should be {transformed_gt_cols}"
                 )
 
-            # Convert rows to lowercase strings for case-insensitive comparison
-            gt_rows = set(str(row).lower() for row in gt_table.to_numpy().tolist())
-            data_rows = set(str(row).lower() for row in data_table.to_numpy().tolist())
-            total_gt_rows += len(gt_rows)
-            total_correct_rows += len(gt_rows.intersection(data_rows))
-            additional = data_rows.difference(gt_rows)
+            # Hash lowercased rows for case-insensitive comparison
+            gt_hashes, gt_first = _hash_rows(gt_table)
+            data_hashes, data_first = _hash_rows(data_table)
+            gt_unique = gt_hashes[gt_first]
+            data_unique = data_hashes[data_first]
+            total_gt_rows += len(gt_unique)
+            total_correct_rows += int(np.isin(gt_unique, data_unique).sum())
+            additional = data_table[data_first & ~np.isin(data_hashes, gt_unique)]
             total_additional_rows += len(additional)
-            missing = gt_rows.difference(data_rows)
+            missing = gt_table[gt_first & ~np.isin(gt_hashes, data_unique)]
             if len(additional) != 0 or len(missing) != 0:
                 logger.info(
                     f"Table {table_name} ({data_table.shape[0]} rows,"
-                    f" {gt_table.shape[0]} GT rows) contains {len(additional)}"
+                    f" {gt_rows[table_name]} GT rows) contains {len(additional)}"
                     f" additional rows and is missing {len(missing)} rows"
                 )
             if len(additional) != 0:
-                DataFrame(additional).to_csv(
+                additional.to_csv(
                     os.path.join(output_dir, table_name + "_additional.csv"),
                     index=False,
                 )
             if len(missing) != 0:
-                DataFrame(missing).to_csv(
+                missing.to_csv(
                     os.path.join(output_dir, table_name + "_missing.csv"),
                     index=False,
                 )
@@ -333,14 +385,19 @@ def produce_times_tables(
         this.
         """
         if "source_filename" in df.columns:
-            df["file_order"] = df["source_filename"].map(file_order)
-            df = df.sort_values(by="file_order", kind="stable")
-            df = df.drop(columns=["source_filename", "file_order"])
-        df = df.drop_duplicates(keep="last")
-        return df.reset_index(drop=True)
+            df = df.sort_values(
+                by="source_filename",
+                key=lambda filenames: filenames.map(file_order),
+                kind="stable",
+            ).drop(columns="source_filename")
+        # drop_duplicates factorizes each column in C, which measured faster than
+        # deduplicating on hash_pandas_object row hashes (and cannot collide)
+        return df.drop_duplicates(keep="last").reset_index(drop=True)
 
     result = {}
     used_tables = set()
+    # Lowercased values of the columns used in filter_rows, by (xl_name, column)
+    lowered: dict[tuple[str, str], np.ndarray] = {}
     for mapping in mappings:
         if mapping.xl_name not in input:
             logger.info(
@@ -350,16 +407,21 @@ def produce_times_tables(
         else:
             used_tables.add(mapping.xl_name)
             df = input[mapping.xl_name]
-            # Filter rows according to filter_rows mapping:
-            for filter_col, filter_val in mapping.filter_rows.items():
-                if filter_col not in df.columns:
-                    logger.info(
-                        f"Cannot produce table {mapping.times_name} because"
-                        f" {mapping.xl_name} does not contain column {filter_col}"
-                    )
-                    # TODO break this loop and continue outer loop?
-                filter = set(x.lower() for x in (filter_val,))
-                i = df[filter_col].str.lower().isin(filter)
+            # Filter rows according to filter_rows mapping, selecting rows only once:
+            if mapping.filter_rows:
+                i = np.ones(len(df), dtype=bool)
+                for filter_col, filter_val in mapping.filter_rows.items():
+                    if filter_col not in df.columns:
+                        logger.info(
+                            f"Cannot produce table {mapping.times_name} because"
+                            f" {mapping.xl_name} does not contain column {filter_col}"
+                        )
+                        # TODO break this loop and continue outer loop?
+                    # Many mappings filter the same table column, so lowercase it once
+                    key = (mapping.xl_name, filter_col)
+                    if key not in lowered:
+                        lowered[key] = df[filter_col].str.lower().to_numpy()
+                    i &= lowered[key] == filter_val.lower()
                 df = df[i]
             if not set(mapping.xl_cols).issubset(df.columns):
                 missing = set(mapping.xl_cols).difference(df.columns)
@@ -369,26 +431,23 @@ def produce_times_tables(
                     f" - {', '.join(missing)}"
                 )
             else:
-                # Ensure that df is not a view
-                df = df.reset_index(drop=True)
-                # Excel columns can be duplicated into multiple Times columns
-                for times_col, xl_col in mapping.col_map.items():
-                    df[times_col] = df[xl_col]
-                # Keep only the required columns
-                cols_to_keep = set(mapping.times_cols).union({"source_filename"})
-                cols_to_drop = [x for x in df.columns if x not in cols_to_keep]
-                df = df.drop(columns=cols_to_drop)
+                # Build a new frame with only the required columns, rather than
+                # copying the whole input table. Excel columns can be duplicated
+                # into multiple Times columns.
+                columns = {
+                    times_col: df[xl_col]
+                    for times_col, xl_col in mapping.col_map.items()
+                }
+                if "source_filename" in df.columns:
+                    columns["source_filename"] = df["source_filename"]
+                df = DataFrame(columns)
                 # Drop duplicates, keeping last seen rows as per file order
                 df = keep_last_by_file_order(df)
                 # Drop rows with missing values
                 # TODO this is a hack. Use pd.StringDtype() so that notna() is sufficient
-                i = (
-                    df[mapping.times_cols[-1]].notna()
-                    & (df != "None").all(axis=1)
-                    & (df != "nan").all(axis=1)
-                    & (df != "").all(axis=1)
-                    & (df != "<NA>").all(axis=1)
-                )
+                # Hash-based membership test: a single pass over each column
+                is_missing = df.isin(_missing_values).to_numpy().any(axis=1)
+                i = df[mapping.times_cols[-1]].notna().to_numpy() & ~is_missing
                 df = df.loc[i, mapping.times_cols]
                 # Drop tables that are empty after filtering and dropping Nones:
                 if len(df) == 0:
@@ -407,35 +466,83 @@ def produce_times_tables(
 def write_dd_files(tables: dict[str, DataFrame], config: Config, output_dir: str):
     encoding = "utf-8"
     os.makedirs(output_dir, exist_ok=True)
-    for item in os.listdir(output_dir):
-        if item.endswith(".dd"):
-            os.remove(os.path.join(output_dir, item))
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".dd") and entry.is_file():
+                os.remove(entry.path)
+
+    def join_keys(df: DataFrame, positions: list[int]) -> Iterator[str]:
+        """Join the values of the columns at `positions` in each row with the GAMS
+        index separator.
+        """
+        # Columns are selected by position, as TIMES indexes can repeat a name
+        # (e.g. ALL_R twice in IRE_BND) and selecting such a label gives a DataFrame.
+        # Mapping str.join over the zipped columns keeps the per-row loop in C, which
+        # is faster than chaining Series.str.cat as that builds a string per column
+        columns = (df.iloc[:, j].astype(str).to_numpy() for j in positions)
+        return map("'.'".join, zip(*columns))
+
+    def sort_rows(df: DataFrame, positions: list[int], end: str = "'") -> DataFrame:
+        """Sort rows in the lexical order of their output lines, which is cheaper
+        than sorting the formatted lines themselves.
+
+        `end` is the character that follows each value of the columns at `positions`
+        in the line.
+        """
+        # Appending the character that ends each value makes a key sort after any key
+        # it is a prefix of exactly when its line does, so column-wise order matches
+        # line order. This assumes that quoted values do not contain a quote character.
+        # np.lexsort is slow on strings, so sort the codes that factorize assigns in
+        # lexical order instead; columns are selected by position as names can repeat
+        codes = [
+            pd.factorize(df.iloc[:, j].astype(str) + end, sort=True)[0]
+            for j in positions
+        ]
+        return df.iloc[np.lexsort(codes[::-1])]
 
-    def convert_set(df: DataFrame):
+    def chunks(df: DataFrame) -> Iterator[DataFrame]:
+        for start in range(0, len(df), _dd_chunk_rows):
+            yield df.iloc[start : start + _dd_chunk_rows]
+
+    def convert_set(df: DataFrame, sort: bool) -> Iterator[list[str]]:
         has_description = "TEXT" in df.columns
+        query_columns = [c for c in df.columns if c != "TEXT"]
+        key_positions = [j for j, c in enumerate(df.columns) if c != "TEXT"]
         # Remove duplicate rows, ignoring text column
         if has_description:
-            query_columns = [c for c in df.columns if c != "TEXT"]
             df = df.drop_duplicates(subset=query_columns, keep="last")
-        for row in df.itertuples(index=False):
-            row_str = "'.'".join(
-                (str(x) for k, x in row._asdict().items() if k != "TEXT")
-            )
-            desc = f" '{row.TEXT}'" if has_description else ""
-            yield f"'{row_str}'{desc}\n"
+        if sort:
+            df = sort_rows(df, key_positions)
+        for chunk in chunks(df):
+            keys = join_keys(chunk, key_positions)
+            if has_description:
+                descriptions = chunk["TEXT"].astype(str).to_numpy()
+                yield [f"'{k}' '{d}'\n" for k, d in zip(keys, descriptions)]
+            else:
+                yield [f"'{k}'\n" for k in keys]
 
-    def convert_parameter(tablename: str, df: DataFrame):
+    def convert_parameter(
+        tablename: str, df: DataFrame, sort: bool
+    ) -> Iterator[list[str]]:
         if "VALUE" not in df.columns:
             raise KeyError(f"Unable to find VALUE column in parameter {tablename}")
         # Remove duplicate rows, ignoring value column
-        query_columns = [c for c in df.columns if c != "VALUE"] or None
-        df = df.drop_duplicates(subset=query_columns, keep="last")
-        for row in df.itertuples(index=False):
-            val = row.VALUE
-            row_str = "'.'".join(
-                (str(x) for k, x in row._asdict().items() if k != "VALUE")
-            )
-            yield f"'{row_str}' {val}\n" if row_str else f"{val}\n"
+        query_columns = [c for c in df.columns if c != "VALUE"]
+        key_positions = [j for j, c in enumerate(df.columns) if c != "VALUE"]
+        df = df.drop_duplicates(subset=query_columns or None, keep="last")
+        if sort:
+            if key_positions:
+                df = sort_rows(df, key_positions)
+            else:
+                # Scalar parameters are written as unquoted values, one per line
+                df = sort_rows(df, [df.columns.get_loc("VALUE")], end="\n")
+        for chunk in chunks(df):
+            values = chunk["VALUE"].astype(str).to_numpy()
+            if key_positions:
+                keys = join_keys(chunk, key_positions)
+                yield [f"'{k}' {v}\n" for k, v in zip(keys, values)]
+            else:
+                yield [f"{v}\n" for v in values]
 
     sets = {m.times_name for m in config.times_xl_maps if "VALUE" not in m.col_map}
 
@@ -455,16 +562,16 @@ def write_dd_files(tables: dict[str, DataFrame], config: Config, output_dir: str
                 fout.write("$ONEPS\n$ONWARNING\n\n")
             for tablename in [t for t in tablenames if t in tables]:
                 df = tables[tablename]
+                # Sort lines to ensure consistent output, except for ALL_TS
+                sort = tablename != "ALL_TS"
                 if tablename in sets:
                     fout.write(f"SET {tablename}\n/\n")
-                    lines = convert_set(df)
+                    chunked_lines = convert_set(df, sort)
                 else:
                     fout.write(f"PARAMETER\n{tablename} ' '/\n")
-                    lines = convert_parameter(tablename, df)
-                # Sort lines to ensure consistent output, except for ALL_TS
-                if tablename != "ALL_TS":
-                    lines = sorted(lines)
-                fout.writelines(lines)
+                    chunked_lines = convert_parameter(tablename, df, sort)
+                for lines in chunked_lines:
+                    fout.writelines(lines)
                 fout.write("\n/;\n")
 
     logger.success(
@@ -531,10 +638,13 @@ def run(args: argparse.Namespace) -> str | None:
 
     if len(args.input) == 1:
         assert os.path.isdir(args.input[0])
+        # os.walk is scandir-based and avoids creating a Path for every directory entry
         input_files = [
-            str(path)
-            for path in Path(args.input[0]).rglob("*")
-            if path.suffix in [".xlsx", ".xlsm"] and not path.name.startswith("~")
+            os.path.join(dirpath, name)
+            for dirpath, _, filenames in os.walk(os.path.normpath(args.input[0]))
+            for name in filenames
+            if os.path.splitext(name)[1] in [".xlsx", ".xlsm"]
+            and not name.startswith("~")
         ]
         if utils.is_veda_based(input_files):
             input_files = utils.filter_veda_filename_patterns(input_files)
@@ -570,7 +680,12 @@ def run(args: argparse.Namespace) -> str | None:
         sys.exit(0)
 
     tables = convert_xl_to_times(
-        input_files, args.output_dir, config, model, args.no_cache
+        input_files,
+        args.output_dir,
+        config,
+        model,
+        args.no_cache,
+        debug_dumps=args.debug_dumps,
     )
 
     if args.dd:
@@ -637,6 +752,11 @@ def parse_args(arg_list: None | list[str]) -> argparse.Namespace:
         action="store_true",
         help="Ignore cache and re-extract tables from XLSX files",
     )
+    args_parser.add_argument(
+        "--debug_dumps",
+        action="store_true",
+        help="Write raw_tables.txt and merged_tables.txt with intermediate tables to the output directory",
+    )
     args_parser.add_argument(
         "-v",
         "--verbose",
@@ -1,9 +1,8 @@
 import re
 import time
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor
 from dataclasses import replace
-from functools import reduce
+from functools import partial, reduce
 from itertools import groupby
 from pathlib import Path
 from typing import Any
@@ -16,7 +15,6 @@ from tqdm import tqdm
 
 from . import utils
 from .datatypes import Config, DataModule, EmbeddedXlTable, Tag, TimesModel
-from .utils import max_workers
 
 csets_ordered_for_pcg = ["DEM", "MAT", "NRG", "ENV", "FIN"]
 default_pcg_suffixes = [
@@ -201,17 +199,22 @@ def remove_tables_with_formulas(
     list[EmbeddedXlTable]
         List of tables in EmbeddedXlTable format without any formulas.
     """
-
-    def is_formula(s):
-        return isinstance(s, str) and len(s) > 0 and s[0] == "="
-
-    def has_formulas(table):
-        has = table.dataframe.map(is_formula).any(axis=None)
+    has_formulas = utils.pmap(_has_formulas, tables)
+    result = []
+    for table, has in zip(tables, has_formulas):
         if has:
             logger.warning(f"Excluding table {table.tag} because it has formulas")
-        return has
+        else:
+            result.append(table)
+    return result
+
 
-    return [table for table in tables if not has_formulas(table)]
+def _is_formula(s) -> bool:
+    return isinstance(s, str) and len(s) > 0 and s[0] == "="
+
+
+def _has_formulas(table: EmbeddedXlTable) -> bool:
+    return table.dataframe.map(_is_formula).any(axis=None)
 
 
 def validate_input_tables(
@@ -532,59 +535,70 @@ def process_flexible_import_tables(
 
     attributes = config.all_attributes.union(config.attr_aliases)
 
-    def process_flexible_import_table(
-        table: EmbeddedXlTable,
-    ) -> EmbeddedXlTable:
-        # Make sure it's a flexible import table, and return the table untouched if not
-        if not table.tag == Tag.fi_t:
-            return table
+    # Process the FI_T tables in parallel, leaving all other tables untouched
+    fi_tables = [t for t in tables if t.tag == Tag.fi_t]
+    processed = iter(
+        utils.pmap(
+            partial(
+                _process_flexible_import_table,
+                index_columns=config.known_columns[Tag.fi_t],
+                legal_values=legal_values,
+                attributes=attributes,
+            ),
+            fi_tables,
+        )
+    )
+    return [next(processed) if t.tag == Tag.fi_t else t for t in tables]
 
-        # Rename, add and remove specific columns if the circumstances are right
-        df = table.dataframe
 
-        # Tag column no longer used to identify data columns
-        # https://veda-documentation.readthedocs.io/en/latest/pages/introduction.html#veda2-0-enhanced-features
-
-        index_columns = config.known_columns[Tag.fi_t].intersection(df.columns)
-        # This takes care of the case where the table has repeated column names
-        # There can be aliases in between the columns, so it should probably stay this way
-        data_columns = [col for col in df.columns if col not in index_columns]
-        # Check if all data columns are years or attributes
-        is_all_year = all([is_year(col) for col in data_columns])
-        is_all_attr = all(
-            [col.split("~")[0].upper() in attributes for col in data_columns]
-        )
-        # Convert dataframe to the long format
-        if data_columns:
-            if is_all_attr and "attribute" not in df.columns:
-                df = pd.melt(
-                    df,
-                    id_vars=list(index_columns),
-                    var_name="attribute",
-                    value_name="value",
-                    ignore_index=False,
-                )
-            elif is_all_year and "year" not in df.columns:
-                df = pd.melt(
-                    df,
-                    id_vars=list(index_columns),
-                    var_name="year",
-                    value_name="value",
-                    ignore_index=False,
-                )
-            else:
-                df = _custom_melt(df, data_columns)
+def _process_flexible_import_table(
+    table: EmbeddedXlTable,
+    index_columns: set[str],
+    legal_values: dict[str, set[str]],
+    attributes: set[str],
+) -> EmbeddedXlTable:
+    # Rename, add and remove specific columns if the circumstances are right
+    df = table.dataframe
 
-        # Harmonise attributes
-        df = _harmonise_attributes(df, legal_values)
-        df = df.reset_index(drop=True)
-        # The rows below will be dropped later on when the topology info is stored.
-        if "value" not in df.columns:
-            df["value"] = pd.NA
+    # Tag column no longer used to identify data columns
+    # https://veda-documentation.readthedocs.io/en/latest/pages/introduction.html#veda2-0-enhanced-features
+
+    index_columns = index_columns.intersection(df.columns)
+    # This takes care of the case where the table has repeated column names
+    # There can be aliases in between the columns, so it should probably stay this way
+    data_columns = [col for col in df.columns if col not in index_columns]
+    # Check if all data columns are years or attributes
+    is_all_year = all([is_year(col) for col in data_columns])
+    is_all_attr = all([col.split("~")[0].upper() in attributes for col in data_columns])
+    # Convert dataframe to the long format
+    if data_columns:
+        if is_all_attr and "attribute" not in df.columns:
+            df = pd.melt(
+                df,
+                id_vars=list(index_columns),
+                var_name="attribute",
+                value_name="value",
+                ignore_index=False,
+            )
+        elif is_all_year and "year" not in df.columns:
+            df = pd.melt(
+                df,
+                id_vars=list(index_columns),
+                var_name="year",
+                value_name="value",
+                ignore_index=False,
+            )
+        else:
+            df = _custom_melt(df, data_columns)
 
-        return replace(table, dataframe=df)
+    # Harmonise attributes
+    df = _harmonise_attributes(df, legal_values)
+    df = df.reset_index(drop=True)
+    # The rows below will be dropped later on when the topology info is stored.
+    if "value" not in df.columns:
+        df["value"] = pd.NA
 
-    return [process_flexible_import_table(t) for t in tables]
+    return replace(table, dataframe=df)
 
 
 def _get_colname(value, legal_values):
@@ -3449,7 +3463,4 @@ def expand_rows_parallel(
         (config.lists_columns[Tag(table.tag)] if Tag.has_tag(table.tag) else set())
         for table in tables
     ]
-    with ProcessPoolExecutor(max_workers) as executor:
-        return list(
-            executor.map(expand_rows, query_columns_lists, lists_columns_lists, tables)
-        )
+    return utils.pmap(expand_rows, query_columns_lists, lists_columns_lists, tables)
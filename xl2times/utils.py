@@ -8,6 +8,8 @@ import gzip
 import os
 import pickle
 import sys
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import replace
 from math import floor, log10
 from pathlib import Path, PurePath
@@ -25,6 +27,38 @@ from . import datatypes
 max_workers: int = 4 if os.name == "nt" else min(16, os.cpu_count() or 16)
 
 
+@functools.cache
+def get_executor() -> ProcessPoolExecutor:
+    """Return the process pool shared by all parallel steps of a conversion, creating
+    it on first use.
+
+    Reusing one pool across the pipeline avoids paying the worker start-up cost for
+    every parallel step. Call `shutdown_executor` once the conversion is done, also when
+    it fails, so that a broken pool is not reused by later conversions.
+    """
+    return ProcessPoolExecutor(max_workers)
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared process pool, if one has been created."""
+    if get_executor.cache_info().currsize > 0:
+        try:
+            get_executor().shutdown()
+        finally:
+            get_executor.cache_clear()
+
+
+def pmap(fn: Callable, *iterables: Iterable) -> list:
+    """Parallel version of `list(map(fn, *iterables))` using the shared process pool.
+
+    `fn` and all items must be picklable, so use module-level functions (together
+    with `functools.partial` for extra arguments) rather than closures or lambdas.
+    """
+    args = [list(it) for it in iterables]
+    chunksize = max(1, len(args[0]) // (4 * max_workers)) if args else 1
+    return list(get_executor().map(fn, *args, chunksize=chunksize))
+
+
 def apply_composite_tag(table: datatypes.EmbeddedXlTable) -> datatypes.EmbeddedXlTable:
     """Handles table level declarations.
 